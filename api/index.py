@@ -1,12 +1,19 @@
 import os
-import json
+import orjson
+import base64
 import asyncio
-from datetime import datetime, timezone
-from flask import Flask, jsonify, request
+import concurrent.futures
+import atexit
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from flask import Flask, request
 from flask_cors import CORS # Re-import the CORS library
-from dotenv import load_dotenv
+from flask_compress import Compress
 import libsql_client
 import re
+import functools
+import hashlib
 
 app = Flask(__name__)
 
@@ -16,131 +23,420 @@ app = Flask(__name__)
 CORS(app)
 # --- END OF FINAL FIX ---
 
+# Article lists are repetitive JSON (same keys, long image URLs), so they compress several-fold on the wire
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]  # brotli for browsers that offer it, gzip for everything else
+app.config["COMPRESS_LEVEL"] = 6
+app.config["COMPRESS_BR_LEVEL"] = 5
+Compress(app)
+
 TABLE_NAME = "articles"
+FTS_TABLE_NAME = "articles_fts"
 IMAGE_COLUMN_NAME = "article_url_to_image"
+# The grid only needs card fields; the heavy text/JSON columns are served by /article/<rowid>
+LIST_COLUMNS = "rowid, original_title, llm_generated_title, author, source, article_category, article_url_to_image, published_at_epoch"
+DETAIL_COLUMNS = "original_url, summarized_content, historical_context, glossary"
+# Fixed statement text, built once, so every call sends identical SQL and hits Turso's statement cache
+ARTICLE_DETAIL_SQL = f"SELECT {DETAIL_COLUMNS} FROM {TABLE_NAME} WHERE rowid = ?"
+FILTER_CATEGORIES_SQL = "SELECT name FROM article_categories WHERE n > 0 ORDER BY name"
+# article_days holds UTC day numbers; SQLite splits them into (year, month, day) so Python does no date math
+FILTER_DAYS_SQL = """SELECT CAST(strftime('%Y', day * 86400, 'unixepoch') AS INTEGER), CAST(strftime('%m', day * 86400, 'unixepoch') AS INTEGER),
+    CAST(strftime('%d', day * 86400, 'unixepoch') AS INTEGER) FROM article_days WHERE n > 0 ORDER BY day DESC"""
+PAGE_SIZE = 50  # default page; callers may ask for up to MAX_PAGE_SIZE via ?limit=
+MAX_PAGE_SIZE = 200
+# sort option -> (key column, value its NULLs sort as, direction); rowid breaks ties so a (key, rowid) cursor is
+# unambiguous. The key is COALESCE(column, null value) in ORDER BY, the cursor and update_db's indexes alike,
+# so undated or untitled rows still have a key a cursor can resume after
+SORT_KEYS = {"Newest First": ("published_at_epoch", 0, "DESC"), "Oldest First": ("published_at_epoch", 0, "ASC"), "A-Z": ("original_title", "", "ASC"), "Z-A": ("original_title", "", "DESC")}
+EPOCH_KEY = "COALESCE(published_at_epoch, 0)"
+TITLE_KEY = "COALESCE(original_title, '')"
+SORT_KEY_EXPRS = {"published_at_epoch": EPOCH_KEY, "original_title": TITLE_KEY}
+FILTER_OPTIONS_TTL = 300  # seconds; filter options only change when the ingest job writes new rows
+ARTICLES_CACHE_TTL = 60  # seconds a serialized /articles page may be reused
+ARTICLES_CACHE_SIZE = 256  # distinct filter/page combinations kept per process
+ARTICLE_QUERY_KEYS = ("search", "sort", "month", "day", "category", "cursor", "limit")
 DEFAULT_IMAGE = "https://images.unsplash.com/photo-1586339949916-3e9457bef6d3?ixlib=rb-4.0.3&ixid=M3wxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8fA%3D%3D&auto=format&fit=crop&w=600&q=80"
 
+DB_MAX_CONCURRENCY = 8  # in-flight statements per instance against Turso
+DB_TIMEOUT = 20  # seconds a request waits on Turso; kept under gunicorn's 30s worker timeout
+
+_filter_cache = {"ts": 0.0, "value": None}  # value: (serialized /filter-options body, its ETag)
+_filter_cache_lock = threading.Lock()
+
+# Credentials are resolved and checked once at import rather than on every client (re)build
+TURSO_URL = (os.getenv("TURSO_DATABASE_URL") or "").replace("libsql://", "https://")
+TURSO_AUTH_TOKEN = os.getenv("TURSO_AUTH_TOKEN")
+if not TURSO_URL or not TURSO_AUTH_TOKEN: print("DATABASE ERROR: Missing Turso credentials.")
+
 def create_db_client():
-    url = os.getenv("TURSO_DATABASE_URL")
-    auth_token = os.getenv("TURSO_AUTH_TOKEN")
-    if not url or not auth_token:
-        print("DATABASE ERROR: Missing Turso credentials.")
-        return None
-    url = url.replace("libsql://", "https://")
-    return libsql_client.create_client(url=url, auth_token=auth_token)
-
-# This is the original date formatting function
-def format_date_for_display(date_obj):
-    if not date_obj: return "Unknown Date"
+    if not TURSO_URL or not TURSO_AUTH_TOKEN: return None
+    return libsql_client.create_client(url=TURSO_URL, auth_token=TURSO_AUTH_TOKEN)
+
+# One long-lived event loop runs all libsql work, so the client (and its open HTTPS
+# connection to Turso) survives between requests instead of being rebuilt by asyncio.run
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+_db_client = None
+_db_semaphore = None
+
+def get_loop():
+    # Started on first use and once per process: a worker forked after import (gunicorn --preload)
+    # inherits the parent's loop object but not the thread running it, so it gets a loop of its own
+    global _loop, _loop_pid, _db_client, _db_semaphore
+    if _loop_pid != os.getpid():
+        with _loop_lock:
+            if _loop_pid != os.getpid():
+                _loop = asyncio.new_event_loop()
+                threading.Thread(target=_loop.run_forever, name="libsql-loop", daemon=True).start()
+                _db_client, _db_semaphore = None, None  # bound to the parent's loop
+                _loop_pid = os.getpid()
+    return _loop
+
+def run_async(coro):
+    # Bounded wait: a stalled Turso call must not pin a gthread worker forever. The coroutine is cancelled on
+    # the loop and the TimeoutError reaches database_timeout() below as a 504
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try: return future.result(timeout=DB_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+def get_db_client():
+    # Only called from coroutines running on _loop, so the lazy init needs no lock
+    global _db_client, _db_semaphore
+    # aiohttp drops dead pooled connections by itself; only a closed session means the client must be rebuilt
+    if _db_client is None or _db_client.closed:
+        _db_client = create_db_client()
+    if _db_semaphore is None: _db_semaphore = asyncio.Semaphore(DB_MAX_CONCURRENCY)
+    return _db_client
+
+async def close_db_client():
+    global _db_client
+    if _db_client is not None and not _db_client.closed: await _db_client.close()
+    _db_client = None
+
+@atexit.register
+def _shutdown_db_client():
+    # The client lives for the whole process; close its aiohttp session while the loop thread is still running
+    if _loop is None or _loop_pid != os.getpid(): return
+    try: asyncio.run_coroutine_threadsafe(close_db_client(), _loop).result(timeout=5)
+    except Exception: pass
+
+MONTH_ABBR = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+MONTH_NAMES = ["", "January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+UNIX_EPOCH_DATE = datetime(1970, 1, 1).date()  # UTC day numbers (epoch // 86400) count from here
+
+# Relative label by calendar day: day numbers are whole UTC days since the epoch (epoch // 86400), so the
+# bucket is one integer subtraction and only the dated labels need a date object at all
+def format_day_label(day, today):
+    days = today - day
+    if 1 < days < 7 or days < 0: return f"{days} days ago"
+    date_obj = UNIX_EPOCH_DATE + timedelta(days=day)
+    month_day = f"{MONTH_ABBR[date_obj.month]} {date_obj.day:02d}"
+    if days == 0: return f"Today, {month_day}"
+    elif days == 1: return f"Yesterday, {month_day}"
+    else: return f"{month_day}, {date_obj.year}"
+
+def month_bounds(month_param, day=None):
+    # Turn "YYYY-MM" / "YYYY - Month" (plus an optional day) into a [start, end) epoch range so the
+    # published_at_epoch indexes can be used instead of strftime() on every row
+    try:
+        if re.match(r'^\d{4}-\d{2}$', month_param): start = datetime.strptime(month_param, '%Y-%m')
+        else: start = datetime.strptime(month_param, '%Y - %B')
+        if day:
+            start = start.replace(day=int(day))
+            end = start + timedelta(days=1)
+        else: end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    except ValueError: return None
+    return int(start.replace(tzinfo=timezone.utc).timestamp()), int(end.replace(tzinfo=timezone.utc).timestamp())
+
+FTS_MIN_TERM = 3  # the trigram index cannot match anything shorter than one trigram
+
+def normalize_filter(value, placeholder=None):
+    # Blank values and the dropdowns' "All ..." placeholders mean "no filter"
+    value = (value or "").strip()
+    return None if not value or value == placeholder else value
+
+def build_fts_query(search):
+    # Quote every token so FTS5 syntax in user input is matched literally; against the trigram index each
+    # quoted token is a case-insensitive substring match. Tokens too short to form a trigram are left to LIKE.
+    return " ".join('"' + token.replace('"', '""') + '"' for token in search.split() if len(token) >= FTS_MIN_TERM)
+
+def short_search_terms(search):
+    # "AI", "UK", "EU": below one trigram, so only LIKE can find them. Single characters are dropped, since
+    # as a substring they match nearly every article
+    return [token for token in search.split() if 1 < len(token) < FTS_MIN_TERM]
+
+# WHERE fragments in the canonical order their parameters are bound; the month range also covers the day filter.
+# Cheap indexed equality/range terms come first so a search predicate is only evaluated on rows they admit.
+FILTER_CLAUSES = (
+    ("category", "article_category = ?"),
+    ("month", f"{EPOCH_KEY} >= ? AND {EPOCH_KEY} < ?"),  # same expression as the sort key, so one index serves both
+    ("search", None),  # search_predicate(): FTS MATCH and/or LIKE terms, in the one search slot
+    ("cursor", None),
+)
+
+FTS_SEARCH_CLAUSE = f"rowid IN (SELECT rowid FROM {FTS_TABLE_NAME} WHERE {FTS_TABLE_NAME} MATCH ?)"
+# Unindexed LIKE over the concatenated search columns: serves terms shorter than a trigram, and the whole
+# search when the FTS table is missing
+SEARCH_COLUMNS = ("original_title", "llm_generated_title", "article_description", "source", "article_content")
+LIKE_SEARCH_CLAUSE = "(" + " || ' ' || ".join(f"COALESCE({col}, '')" for col in SEARCH_COLUMNS) + ") LIKE ? ESCAPE '\\'"
+
+def build_like_pattern(search):
+    escaped = " ".join(search.split()).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def search_predicate(search):
+    # (clause, params) for the search slot: one FTS MATCH for the trigram-sized tokens, ANDed with a LIKE per
+    # shorter token, so "AI regulation" needs both words just as the FTS path alone does for "climate regulation"
+    fts_query, short_terms = build_fts_query(search), short_search_terms(search)
+    # Nothing but single-character tokens ("a b"): match the search as one phrase instead
+    if not fts_query and not short_terms: return LIKE_SEARCH_CLAUSE, [build_like_pattern(search)]
+    clauses = ([FTS_SEARCH_CLAUSE] if fts_query else []) + [LIKE_SEARCH_CLAUSE] * len(short_terms)
+    return " AND ".join(clauses), ([fts_query] if fts_query else []) + [build_like_pattern(term) for term in short_terms]
+
+# Each filter shape x sort x search predicate is built once and cached, so every request of that shape sends
+# byte-identical SQL and Turso's prepared-statement cache gets hits instead of a freshly concatenated string
+@functools.lru_cache(maxsize=512)
+def build_articles_sql(active, sort_option, search_clause=None):
+    sort_col, _, sort_dir = SORT_KEYS[sort_option]
+    sort_key = SORT_KEY_EXPRS[sort_col]
+    where_clauses = [search_clause if name == "search" else clause for name, clause in FILTER_CLAUSES if name in active and (clause or name == "search")]
+    # Keyset pagination: resume after the last row of the previous page instead of OFFSET-scanning
+    # SQLite cannot seek an index with the row-value comparison, so a plain bound on the key leads (the cursor
+    # key is bound twice) and the (key, rowid) comparison only breaks ties within that key
+    if "cursor" in active:
+        op = '<' if sort_dir == 'DESC' else '>'
+        where_clauses.append(f"{sort_key} {op}= ? AND ({sort_key}, rowid) {op} (?, ?)")
+    query = f"SELECT {LIST_COLUMNS} FROM {TABLE_NAME}"
+    if where_clauses: query += " WHERE " + " AND ".join(where_clauses)
+    return query + f" ORDER BY {sort_key} {sort_dir}, rowid {sort_dir} LIMIT ?"
+
+_fts_available = True  # cleared the first time Turso reports the FTS table missing
+
+def encode_cursor(key, rowid):
+    return base64.urlsafe_b64encode(orjson.dumps([key, rowid])).decode()
+
+def cursor_params(key, rowid):
+    # Bound in the order build_articles_sql's cursor clause reads them: key bound, then the (key, rowid) tiebreak
+    return key, key, rowid
+
+def decode_cursor(cursor):
     try:
-        now = datetime.now(timezone.utc)
-        if date_obj.tzinfo is None: date_obj = date_obj.replace(tzinfo=timezone.utc)
-        delta = now - date_obj
-        if delta.days == 0: return f"Today, {date_obj.strftime('%b %d')}"
-        elif delta.days == 1: return f"Yesterday, {date_obj.strftime('%b %d')}"
-        elif delta.days < 7: return f"{delta.days} days ago"
-        else: return date_obj.strftime('%b %d, %Y')
-    except Exception: return "Invalid Date"
+        key, rowid = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        # Sort keys are epochs or titles; anything else (lists, objects, booleans) would only fail inside Turso
+        if isinstance(key, bool) or not isinstance(key, (int, str)): return None
+        return key, int(rowid)
+    except Exception: return None
 
 def rows_to_dict_list(rows):
     if not rows: return []
-    return [dict(zip(rows.columns, row)) for row in rows]
+    # Resolve the column names once and zip against the raw value tuples; libsql Row has no __iter__,
+    # so zipping the Row itself goes through Sequence.__getitem__ once per value
+    cols = tuple(rows.columns)
+    return [dict(zip(cols, row.astuple())) for row in rows]
 
 async def query_articles_async(filters):
-    client = create_db_client()
-    if not client: return []
+    global _fts_available
+    client = get_db_client()
+    if not client: return {"articles": [], "next_cursor": None}
+    category = normalize_filter(filters.get('category'), "All Categories")
+    search = normalize_filter(filters.get('search'))
+    month = normalize_filter(filters.get('month'), "All Months")
+    day = normalize_filter(filters.get('day'), "All Days")
+    active, params = set(), []
+    if category: active.add("category"); params.append(category)
+    if month:
+        bounds = month_bounds(month, day)
+        if not bounds: return {"articles": [], "next_cursor": None}
+        active.add("month"); params.extend(bounds)
+    search_clause = None
+    if search:
+        # A lone character matches nearly every row as a substring, so answer without a round trip
+        if len(search) < 2: return {"articles": [], "next_cursor": None}
+        if _fts_available: search_clause, search_params = search_predicate(search)
+        else: search_clause, search_params = LIKE_SEARCH_CLAUSE, [build_like_pattern(search)]
+        search_i = len(params); active.add("search"); params.extend(search_params)
+
+    sort_option = filters.get('sort') if filters.get('sort') in SORT_KEYS else "Newest First"
+    sort_col, null_key, _ = SORT_KEYS[sort_option]
+    if filters.get('cursor'):
+        cursor = decode_cursor(filters['cursor'])
+        if not cursor: return {"error": "Invalid cursor"}
+        active.add("cursor"); params.extend(cursor_params(*cursor))
+    try: limit = min(max(int(filters.get('limit') or PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    except (TypeError, ValueError): return {"error": "Invalid limit"}
+    params.append(limit)
+
+    active = frozenset(active)
     try:
-        base_query, params = f"SELECT * FROM {TABLE_NAME}", []
-        where_clauses = []
-        if filters.get('category') and filters['category'] != "All Categories":
-            where_clauses.append("article_category = ?"); params.append(filters['category'])
-        if filters.get('search'):
-            search_term = f"%{filters['search'].lower()}%"
-            where_clauses.append("(LOWER(original_title) LIKE ? OR LOWER(llm_generated_title) LIKE ? OR LOWER(article_description) LIKE ? OR LOWER(source) LIKE ? OR LOWER(article_content) LIKE ?)")
-            params.extend([search_term] * 5)
-        if filters.get('month') and filters['month'] != "All Months":
-            month_param = filters['month']
-            # if it's in ISO format "YYYY-MM", use %Y-%m, otherwise fall back to human "%Y - %B"
-            if re.match(r'^\d{4}-\d{2}$', month_param):
-                where_clauses.append("strftime('%Y-%m', published_at_iso) = ?")
-                params.append(month_param)
-            else:
-                where_clauses.append("strftime('%Y - %B', published_at_iso) = ?")
-                params.append(month_param)
-
-        if where_clauses: base_query += " WHERE " + " AND ".join(where_clauses)
-        
-        sort_map = {"Newest First": "published_at_iso DESC", "Oldest First": "published_at_iso ASC", "A-Z": "original_title ASC", "Z-A": "original_title DESC"}
-        sort_order = sort_map.get(filters.get('sort_option'), "published_at_iso DESC")
-        base_query += f" ORDER BY {sort_order} LIMIT 50"
-        
-        result_set = await client.execute(base_query, params)
-        articles = rows_to_dict_list(result_set)
-        for article_dict in articles:
-            def safe_json_loads(x):
-                if not isinstance(x, str) or not x: return []
-                try: return json.loads(x)
-                except Exception: return []
-            article_dict["historical_context"] = safe_json_loads(article_dict.get("historical_context"))
-            article_dict["glossary"] = safe_json_loads(article_dict.get("glossary"))
-            if not article_dict.get(IMAGE_COLUMN_NAME): article_dict[IMAGE_COLUMN_NAME] = DEFAULT_IMAGE
-
-            summary_text = article_dict.get("summarized_content")
-            if not summary_text:
-                summary_text = article_dict.get("article_content", "")
-            article_dict["article_content"] = summary_text
-            
-            try:
-                iso_str = article_dict.get('published_at_iso', '')
-                if iso_str:
-                    if iso_str.endswith('Z'): iso_str = iso_str[:-1] + '+00:00'
-                    dt_obj = datetime.fromisoformat(iso_str)
-                    article_dict['published_at_formatted'] = format_date_for_display(dt_obj)
-                else: article_dict['published_at_formatted'] = "Unknown Date"
-            except Exception: article_dict['published_at_formatted'] = "Unknown Date"
-        return articles
-    finally:
-        if client: await client.close()
+        async with _db_semaphore:
+            result_set = await client.execute(build_articles_sql(active, sort_option, search_clause), params)
+    except libsql_client.LibsqlError as e:
+        if not search_clause or FTS_SEARCH_CLAUSE not in search_clause or FTS_TABLE_NAME not in str(e): raise
+        # The search index has not been created on this database yet; fall back to LIKE from now on
+        print(f"DATABASE WARNING: {FTS_TABLE_NAME} unavailable ({e}); falling back to LIKE search.")
+        _fts_available = False
+        params[search_i:search_i + len(search_params)] = [build_like_pattern(search)]
+        async with _db_semaphore:
+            result_set = await client.execute(build_articles_sql(active, sort_option, LIKE_SEARCH_CLAUSE), params)
+    # One pass over the raw value tuples: fix up the image and append the date label positionally, then build
+    # each output dict once instead of materializing it and patching keys in afterwards
+    cols = tuple(result_set.columns)
+    out_cols = cols + ('published_at_formatted',)
+    image_i, epoch_i = cols.index(IMAGE_COLUMN_NAME), cols.index('published_at_epoch')
+    today = int(time.time()) // 86400
+    labels_by_day = {None: "Unknown Date"}  # every article on the same UTC day shares a label
+    articles = []
+    for row in result_set.rows:
+        values = list(row.astuple())
+        if not values[image_i]: values[image_i] = DEFAULT_IMAGE
+        epoch = values[epoch_i]
+        day_key = epoch // 86400 if isinstance(epoch, int) else None
+        label = labels_by_day.get(day_key)
+        if label is None: label = labels_by_day[day_key] = format_day_label(day_key, today)
+        values.append(label)
+        articles.append(dict(zip(out_cols, values)))
+    next_cursor = None
+    if len(articles) == limit:
+        last = articles[-1]
+        next_cursor = encode_cursor(null_key if last[sort_col] is None else last[sort_col], last["rowid"])
+    return {"articles": articles, "next_cursor": next_cursor}
+
+async def get_article_detail_async(rowid):
+    client = get_db_client()
+    if not client: return None
+    async with _db_semaphore:
+        result_set = await client.execute(ARTICLE_DETAIL_SQL, [rowid])
+    rows = rows_to_dict_list(result_set)
+    if not rows: return None
+    article_dict = rows[0]
+    # Both columns hold JSON arrays canonicalized by update_db's to_json_text (init_db rewrites older rows);
+    # embed the text as-is instead of decoding it here only for orjson to encode it straight back
+    for key in ("historical_context", "glossary"):
+        raw = article_dict.get(key)
+        article_dict[key] = orjson.Fragment(raw) if isinstance(raw, str) and raw.startswith("[") else []
+    return article_dict
+
+async def check_db_async():
+    client = get_db_client()
+    if not client: return False
+    async with _db_semaphore:
+        await client.execute("SELECT 1")
+    return True
+
+# published_at_epoch and the filter summary tables only exist once update_db.init_db has migrated the database;
+# /articles and /filter-options cannot serve one without them, so the app refuses to start instead of 500ing
+SCHEMA_PROBES = [
+    f"SELECT published_at_epoch FROM {TABLE_NAME} LIMIT 0",
+    "SELECT name, n FROM article_categories LIMIT 0",
+    "SELECT day, n FROM article_days LIMIT 0",
+]
+
+async def check_schema_async():
+    client = get_db_client()
+    if not client: return
+    async with _db_semaphore:
+        await client.batch(SCHEMA_PROBES)
+
+def require_migrated_schema():
+    try: run_async(check_schema_async())
+    except libsql_client.LibsqlError as e:
+        if "no such" not in str(e):
+            print(f"DATABASE WARNING: schema check failed ({e}); starting anyway.")
+            return
+        raise RuntimeError(f"DATABASE ERROR: {e}. Run update_db.py (init_db) against this database before starting the API.") from e
+    except Exception as e: print(f"DATABASE WARNING: schema check failed ({e}); starting anyway.")
 
 async def get_filter_options_async():
-    client = create_db_client()
+    client = get_db_client()
     if not client: return {"error": "DB connection failed"}
     options = {"categories": ["All Categories"], "months": ["All Months"], "days_by_month": {"All Months": ["All Days"]}, "all_unique_days": ["All Days"]}
-    try:
-        cat_rows = await client.execute(f"SELECT DISTINCT article_category FROM {TABLE_NAME} WHERE article_category IS NOT NULL AND article_category != ''")
-        options["categories"].extend(sorted(list(set([row[0] for row in cat_rows if row[0]]))))
-        
-        date_rows = await client.execute(f"SELECT DISTINCT published_at_iso FROM {TABLE_NAME} WHERE published_at_iso IS NOT NULL AND published_at_iso != ''")
-        dates_str = [row[0] for row in date_rows]
-        if dates_str:
-            all_dates = []
-            for date_s in dates_str:
-                try:
-                    if date_s.endswith('Z'): date_s = date_s[:-1] + '+00:00'
-                    all_dates.append(datetime.fromisoformat(date_s))
-                except Exception: continue
-            if all_dates:
-                options["months"].extend(sorted(list(set([d.strftime('%Y - %B') for d in all_dates])), key=lambda d: datetime.strptime(d, '%Y - %B'), reverse=True))
-                days_by_month_dict = {}
-                for d in all_dates:
-                    ym_str = d.strftime('%Y - %B');
-                    if ym_str not in days_by_month_dict: days_by_month_dict[ym_str] = set()
-                    days_by_month_dict[ym_str].add(str(d.day))
-                for ym_str, days_set in days_by_month_dict.items():
-                    options["days_by_month"][ym_str] = ["All Days"] + sorted(list(days_set), key=int)
-                options["all_unique_days"].extend(sorted(list(set([str(d.day) for d in all_dates])), key=int))
-        return options
-    finally:
-        if client: await client.close()
+    # Both lookups read the trigger-maintained summary tables (a few dozen rows, no scan of articles),
+    # and go to Turso in a single batch request: one HTTP round trip instead of two
+    async with _db_semaphore:
+        cat_rows, day_rows = await client.batch([
+            FILTER_CATEGORIES_SQL,
+            FILTER_DAYS_SQL,
+        ])
+    options["categories"].extend(row[0] for row in cat_rows)
+
+    days_by_month_dict = {}  # "YYYY - Month" -> set of day-of-month, filled newest month first
+    for year, month, day in (row.astuple() for row in day_rows):
+        ym_str = f"{year} - {MONTH_NAMES[month]}"
+        if ym_str not in days_by_month_dict: days_by_month_dict[ym_str] = set()
+        days_by_month_dict[ym_str].add(day)
+    options["months"].extend(days_by_month_dict)
+    for ym_str, days_set in days_by_month_dict.items():
+        options["days_by_month"][ym_str] = ["All Days"] + [str(day) for day in sorted(days_set)]
+    options["all_unique_days"].extend(str(day) for day in sorted(set().union(*days_by_month_dict.values())))
+    return options
+
+def json_response(obj, status=200):
+    # orjson serializes in C and hands back bytes, skipping jsonify's pure-Python encoder loop
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+ARTICLE_QUERY_PLACEHOLDERS = {"category": "All Categories", "month": "All Months", "day": "All Days"}
+
+def article_query_key(args):
+    # Canonical filters: a padded search, an "All ..." placeholder or an omitted/unknown sort resolve to
+    # the same tuple as their plain equivalent, so equivalent requests share one cache entry
+    key = {k: normalize_filter(args.get(k), ARTICLE_QUERY_PLACEHOLDERS.get(k)) for k in ARTICLE_QUERY_KEYS}
+    if key["sort"] not in SORT_KEYS: key["sort"] = "Newest First"
+    return tuple(key[k] for k in ARTICLE_QUERY_KEYS)
+
+@functools.lru_cache(maxsize=ARTICLES_CACHE_SIZE)
+def cached_articles_response(query, time_bucket):
+    # time_bucket is part of the key only so entries stop matching once their TTL window has passed
+    articles_data = run_async(query_articles_async(dict(zip(ARTICLE_QUERY_KEYS, query))))
+    return orjson.dumps(articles_data), 400 if "error" in articles_data else 200
+
+@app.errorhandler(concurrent.futures.TimeoutError)
+def database_timeout(error):
+    return json_response({"error": "Database timed out"}, 504)
 
 @app.route('/articles', methods=['GET'])
 def get_articles():
-    filters = {'search': request.args.get('search'), 'sort_option': request.args.get('sort'), 'month': request.args.get('month'), 'day': request.args.get('day'), 'category': request.args.get('category')}
-    articles_data = asyncio.run(query_articles_async(filters))
-    return jsonify(articles_data)
+    # Repeat requests for the same filters and page (the default first page above all) are served as
+    # cached bytes; the articles table only changes when the ingest job runs
+    query = article_query_key(request.args)
+    body, status = cached_articles_response(query, int(time.monotonic() // ARTICLES_CACHE_TTL))
+    return app.response_class(body, status=status, mimetype='application/json')
+
+@app.route('/article/<int:rowid>', methods=['GET'])
+def get_article_detail(rowid):
+    article = run_async(get_article_detail_async(rowid))
+    if article is None: return json_response({"error": "Article not found"}, 404)
+    return json_response(article)
 
 @app.route('/filter-options', methods=['GET'])
 def get_filter_options():
-    options = asyncio.run(get_filter_options_async())
-    if "error" in options: return jsonify(options), 500
-    return jsonify(options)
+    # The serialized body is cached, so a hit skips the event loop, the queries and orjson.dumps alike
+    with _filter_cache_lock:
+        cached = _filter_cache["value"] if time.monotonic() - _filter_cache["ts"] < FILTER_OPTIONS_TTL else None
+    if cached is None:
+        options = run_async(get_filter_options_async())
+        if "error" in options: return json_response(options, 500)
+        body = orjson.dumps(options)
+        cached = (body, hashlib.blake2b(body, digest_size=12).hexdigest())
+        with _filter_cache_lock:
+            _filter_cache["ts"], _filter_cache["value"] = time.monotonic(), cached
+    body, etag = cached
+    # Browsers and the CDN may reuse the options for the same TTL, then revalidate with If-None-Match
+    # and get a bodiless 304 while the options are unchanged
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = FILTER_OPTIONS_TTL
+    return response.make_conditional(request)
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    # Constant-time liveness probe: a SELECT 1 round trip, never a scan of the articles table
+    try: ok = run_async(check_db_async())
+    except Exception: ok = False
+    return json_response({"ok": ok}, 200 if ok else 503)
+
+# At import, so with preload_app gunicorn fails in the master before forking any worker
+require_migrated_schema()
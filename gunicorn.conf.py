@@ -0,0 +1,18 @@
+# Gunicorn picks this file up automatically: gunicorn api.index:app
+# Run update_db.py against the database first: the app checks for the columns and summary tables that
+# update_db.init_db creates and refuses to start without them.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+
+# The handlers spend nearly all their time waiting on Turso. Threaded workers hand those waits to the
+# shared libsql event loop (api/index.py run_async), so many requests overlap their round trips
+# instead of each sync worker serving one request at a time.
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+
+# Safe to preload: every worker starts its own event loop and client on first use
+preload_app = True
+timeout = 30
+keepalive = 5
@@ -5,6 +5,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const loadingIndicator    = document.getElementById('loading-indicator');
   const errorMessageDiv     = document.getElementById('error-message');
   const noResultsMessageDiv = document.getElementById('no-results-message');
+  const loadMoreButton      = document.getElementById('load-more-button');
 
   const searchInput    = document.getElementById('search-input');
   const sortSelect     = document.getElementById('sort-select');
@@ -23,6 +24,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const backendBaseUrl   = 'https://headlinetrail.onrender.com';
   const articlesUrl      = `${backendBaseUrl}/articles`;
   const filterOptionsUrl = `${backendBaseUrl}/filter-options`;
+  const articleDetailUrl = rowid => `${backendBaseUrl}/article/${rowid}`;
 
   let currentFilters = {
     search: '',
@@ -33,9 +35,17 @@ document.addEventListener('DOMContentLoaded', () => {
 
   let availableFilterOptions = { categories: [], months: [] };
 
+  // Keyset pagination: the backend returns next_cursor while more pages remain
+  let nextCursor = null;
+  let articlesRequestId = 0;
+
   const IMAGE_COLUMN_NAME = "article_url_to_image";
   const DEFAULT_IMAGE     = "https://images.unsplash.com/photo-1516116216624-53e697fedbe0?auto=format&fit=crop&w=600&q=80";
 
+  // One regex pass per value; covers quotes too since values also land in attributes
+  const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+  const escapeHTML = value => String(value).replace(/[&<>"']/g, ch => HTML_ESCAPES[ch]);
+
   function hideMessages() {
     errorMessageDiv.style.display = 'none';
     noResultsMessageDiv.style.display = 'none';
@@ -45,58 +55,54 @@ document.addEventListener('DOMContentLoaded', () => {
     newsGrid.style.display          = view === 'news-grid' ? 'grid' : 'none';
     articleDetailView.style.display = view === 'detail'    ? 'block' : 'none';
     filterControlsDiv.style.display = view === 'news-grid' ? 'flex' : 'none';
+    loadMoreButton.style.display    = view === 'news-grid' && nextCursor ? 'block' : 'none';
   }
 
-  function renderArticleGrid(articles) {
-    newsGrid.innerHTML = '';
-    if (!articles || !articles.length) {
+  function renderArticleGrid(articles, append = false) {
+    if (!append) newsGrid.innerHTML = '';
+    if (!append && (!articles || !articles.length)) {
       noResultsMessageDiv.style.display = 'block';
       return;
     }
     noResultsMessageDiv.style.display = 'none';
 
+    // Build the whole page of cards off-DOM and attach it once: one layout pass instead of one per card
+    const fragment = document.createDocumentFragment();
     articles.forEach(article => {
       const card = document.createElement('div');
       card.className = 'news-card';
       const imageUrl = article[IMAGE_COLUMN_NAME] || DEFAULT_IMAGE;
 
       card.innerHTML = `
-        <img src="${imageUrl}" alt="" onerror="this.onerror=null;this.src='${DEFAULT_IMAGE}'">
+        <img src="${escapeHTML(imageUrl)}" alt="" onerror="this.onerror=null;this.src='${DEFAULT_IMAGE}'">
         <div class="card-content">
-          <h6>${article.original_title || 'Untitled'}</h6>
-          <div class="caption">By ${article.author || 'Unknown author'} | Published: ${article.published_at_formatted || 'Unknown'}</div>
+          <h6>${escapeHTML(article.original_title || 'Untitled')}</h6>
+          <div class="caption">By ${escapeHTML(article.author || 'Unknown author')} | Published: ${escapeHTML(article.published_at_formatted || 'Unknown')}</div>
           <button>Read Article</button>
         </div>
       `;
-      card.querySelector('button').addEventListener('click', () => showArticleDetail(article));
-      newsGrid.appendChild(card);
+      card.querySelector('button').addEventListener('click', () => openArticle(article));
+      fragment.appendChild(card);
     });
+    newsGrid.appendChild(fragment);
   }
 
   function renderTimeline(items) {
-    detailTimeline.innerHTML = '';
     if (items && items.length) {
-      items.forEach(e => {
-        const entryDiv = document.createElement('div');
-        entryDiv.innerHTML = `
-          <strong>${e.year || ''} – ${e.title || ''}</strong>
-          <p>${e.summary || ''}</p>
-        `;
-        detailTimeline.appendChild(entryDiv);
-      });
+      detailTimeline.innerHTML = items.map(e => `
+        <div>
+          <strong>${escapeHTML(e.year || '')} – ${escapeHTML(e.title || '')}</strong>
+          <p>${escapeHTML(e.summary || '')}</p>
+        </div>
+      `).join('');
     } else {
       detailTimeline.innerHTML = `<p>No timeline entries available.</p>`;
     }
   }
 
   function renderGlossary(items) {
-    detailGlossary.innerHTML = '';
     if (items && items.length) {
-      items.forEach(e => {
-        const entryDiv = document.createElement('div');
-        entryDiv.innerHTML = `<strong>${e.word || '?'}:</strong> ${e.definition || ''}`;
-        detailGlossary.appendChild(entryDiv);
-      });
+      detailGlossary.innerHTML = items.map(e => `<div><strong>${escapeHTML(e.word || '?')}:</strong> ${escapeHTML(e.definition || '')}</div>`).join('');
     } else {
       detailGlossary.innerHTML = `<p>No glossary terms available.</p>`;
     }
@@ -113,7 +119,7 @@ document.addEventListener('DOMContentLoaded', () => {
       const summaryHTML = `
         <h3>Article Summary</h3>
         <ul style="padding-left:1.2em; margin-top:0.5em;">
-          ${bulletPoints.map(p => `<li>${p}</li>`).join('')}
+          ${bulletPoints.map(p => `<li>${escapeHTML(p)}</li>`).join('')}
         </ul>
       `;
       detailContent.insertAdjacentHTML('beforeend', summaryHTML);
@@ -122,6 +128,20 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
+  // The grid payload only carries card fields; summary, timeline and glossary are fetched on open
+  async function openArticle(article) {
+    hideMessages();
+    try {
+      const resp = await fetch(articleDetailUrl(article.rowid));
+      if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+      const detail = await resp.json();
+      showArticleDetail({ ...article, ...detail });
+    } catch (err) {
+      errorMessageDiv.textContent = `Failed to load article: ${err.message}`;
+      errorMessageDiv.style.display = 'block';
+    }
+  }
+
   function showArticleDetail(article) {
     // reset
     detailContent.innerHTML = '';
@@ -131,7 +151,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // header/meta
     detailTitle.textContent = article.original_title || 'Untitled';
-    detailCaption.innerHTML = [
+    detailCaption.textContent = [
       `By ${article.author || 'Unknown author'}`,
       `Source: ${article.source || 'Unknown'}`,
       `Published: ${article.published_at_formatted || 'Unknown'}`
@@ -224,11 +244,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
-  async function fetchAndRenderArticles(filters) {
-    hideMessages();
-    loadingIndicator.style.display = 'block';
-    newsGrid.innerHTML = '';
-
+  function buildArticleParams(filters) {
     const params = new URLSearchParams();
     if (filters.search)      params.append('search', filters.search);
     if (filters.sort_option) params.append('sort',   filters.sort_option);
@@ -248,13 +264,26 @@ document.addEventListener('DOMContentLoaded', () => {
         params.append('month', filters.month);
       }
     }
+    return params;
+  }
+
+  async function fetchAndRenderArticles(filters) {
+    hideMessages();
+    loadingIndicator.style.display = 'block';
+    newsGrid.innerHTML = '';
+    nextCursor = null;
+    loadMoreButton.style.display = 'none';
+    const requestId = ++articlesRequestId;
 
     try {
-      const resp = await fetch(`${articlesUrl}?${params.toString()}`);
+      const resp = await fetch(`${articlesUrl}?${buildArticleParams(filters).toString()}`);
+      if (requestId !== articlesRequestId) return; // a newer filter change superseded this one
       loadingIndicator.style.display = 'none';
       if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
-      const articles = await resp.json();
-      renderArticleGrid(articles);
+      const data = await resp.json();
+      renderArticleGrid(data.articles);
+      nextCursor = data.next_cursor;
+      loadMoreButton.style.display = nextCursor ? 'block' : 'none';
 
       // ⬆️ After refresh, ensure the grid starts at the top
       window.scrollTo({ top: 0, behavior: 'smooth' });
@@ -265,6 +294,40 @@ document.addEventListener('DOMContentLoaded', () => {
     }
   }
 
+  async function loadMoreArticles() {
+    if (!nextCursor || loadMoreButton.disabled) return;
+    const requestId = articlesRequestId;
+    const params = buildArticleParams(currentFilters);
+    params.append('cursor', nextCursor);
+    loadMoreButton.disabled = true;
+    try {
+      const resp = await fetch(`${articlesUrl}?${params.toString()}`);
+      if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+      const data = await resp.json();
+      if (requestId !== articlesRequestId) return; // filters changed while this page was loading
+      renderArticleGrid(data.articles, true);
+      nextCursor = data.next_cursor;
+      loadMoreButton.style.display = nextCursor ? 'block' : 'none';
+      rearmInfiniteScroll(); // its callback is queued, so it runs after the finally below re-enables the button
+    } catch (err) {
+      // Not re-armed: the button is still in view, so the observer would retry at once, in a loop, against
+      // a failing API. Scrolling it back into view or clicking it tries again
+      errorMessageDiv.textContent = `Failed to load more articles: ${err.message}`;
+      errorMessageDiv.style.display = 'block';
+    } finally {
+      loadMoreButton.disabled = false;
+    }
+  }
+
+  // IntersectionObserver only reports changes: after a short page the button may still sit inside the
+  // rootMargin (or it was disabled when it came into view), so observe it afresh, which re-reports its state
+  let scrollObserver = null;
+  function rearmInfiniteScroll() {
+    if (!scrollObserver || !nextCursor) return;
+    scrollObserver.unobserve(loadMoreButton);
+    scrollObserver.observe(loadMoreButton);
+  }
+
   function handleFilterChange() {
     currentFilters = {
       search:      searchInput.value.trim(),
@@ -285,6 +348,15 @@ document.addEventListener('DOMContentLoaded', () => {
     searchInput._t = setTimeout(handleFilterChange, 250);
   });
 
+  loadMoreButton.addEventListener('click', loadMoreArticles);
+  // Fetch the next page as the button scrolls into view; the button stays as the fallback
+  if ('IntersectionObserver' in window) {
+    scrollObserver = new IntersectionObserver(entries => {
+      if (entries.some(e => e.isIntersecting)) loadMoreArticles();
+    }, { rootMargin: '400px' });
+    scrollObserver.observe(loadMoreButton);
+  }
+
   detailBackButton.addEventListener('click', () => {
     switchView('news-grid');
     // ⬆️ Scroll to top when returning to the grid
@@ -295,7 +367,10 @@ document.addEventListener('DOMContentLoaded', () => {
   (async function init() {
     switchView('news-grid');
     loadingIndicator.style.display = 'block';
-    await fetchFilterOptions();                  // populate dropdowns first
-    await fetchAndRenderArticles(currentFilters); // then initial list
+    // The first page only needs the default filters, so it need not wait on the dropdown options
+    await Promise.all([
+      fetchFilterOptions(),
+      fetchAndRenderArticles(currentFilters)
+    ]);
   })();
 });
@@ -0,0 +1,112 @@
+"""Pure helpers of api/index.py: search predicates, cursors and keyset SQL (run against a local SQLite file)."""
+import importlib.util
+import os
+import pathlib
+import sqlite3
+
+import pytest
+
+for dependency in ("flask", "flask_cors", "flask_compress", "libsql_client", "orjson"):
+    pytest.importorskip(dependency)
+
+# Without credentials the module builds no Turso client, so importing it makes no network calls
+os.environ.pop("TURSO_DATABASE_URL", None)
+os.environ.pop("TURSO_AUTH_TOKEN", None)
+_spec = importlib.util.spec_from_file_location("api_index", pathlib.Path(__file__).resolve().parent.parent / "api" / "index.py")
+api = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(api)
+
+
+def test_fts_query_quotes_tokens_and_leaves_short_ones_to_like():
+    assert api.build_fts_query('AI "quoted" regulation') == '"""quoted""" "regulation"'
+    assert api.build_fts_query("AI UK") == ""
+    assert api.short_search_terms("a AI regulation UK") == ["AI", "UK"]
+
+
+def test_search_predicate_combines_fts_and_like():
+    clause, params = api.search_predicate("AI regulation")
+    assert clause == f"{api.FTS_SEARCH_CLAUSE} AND {api.LIKE_SEARCH_CLAUSE}"
+    assert params == ['"regulation"', "%AI%"]
+
+    clause, params = api.search_predicate("UK EU")
+    assert clause == f"{api.LIKE_SEARCH_CLAUSE} AND {api.LIKE_SEARCH_CLAUSE}"
+    assert params == ["%UK%", "%EU%"]
+
+
+def test_search_predicate_matches_single_character_tokens_as_a_phrase():
+    assert api.search_predicate("a b") == (api.LIKE_SEARCH_CLAUSE, ["%a b%"])
+
+
+def test_like_pattern_escapes_wildcards():
+    assert api.build_like_pattern(" 50%  off_now\\ ") == "%50\\% off\\_now\\\\%"
+
+
+@pytest.mark.parametrize("key", [1722470400, 0, "Some title", ""])
+def test_cursor_round_trip(key):
+    assert api.decode_cursor(api.encode_cursor(key, 42)) == (key, 42)
+
+
+@pytest.mark.parametrize("payload", [b"[[1],2]", b'[{"a":1},2]', b"[true,2]", b"[null,2]", b"[1.5,2]", b'[1,"x"]', b"[1]", b"nope"])
+def test_decode_cursor_rejects_malformed_keys(payload):
+    assert api.decode_cursor(api.base64.urlsafe_b64encode(payload).decode()) is None
+
+
+def test_month_bounds():
+    start, end = api.month_bounds("2025-07")
+    assert end - start == 31 * 86400
+    assert api.month_bounds("2025 - July", "4") == (start + 3 * 86400, start + 4 * 86400)
+    assert api.month_bounds("July 2025") is None
+
+
+@pytest.fixture
+def articles_db(tmp_path):
+    conn = sqlite3.connect(tmp_path / "articles.db")
+    conn.execute("CREATE TABLE articles (original_url TEXT PRIMARY KEY, original_title TEXT, llm_generated_title TEXT, author TEXT, source TEXT, "
+                 "article_category TEXT, article_url_to_image TEXT, published_at_epoch INTEGER)")
+    # Every third row has no date and every fourth no title: those must still be reachable page by page
+    conn.executemany("INSERT INTO articles (original_url, original_title, article_category, published_at_epoch) VALUES (?, ?, ?, ?)", [
+        (f"https://example.com/{i}", None if i % 4 == 0 else f"Title {i % 7}", "Politics" if i % 2 else "Business", None if i % 3 == 0 else 1722470400 + i % 5 * 86400)
+        for i in range(1, 38)
+    ])
+    yield conn
+    conn.close()
+
+
+def fetch_all_pages(conn, sort_option, limit=5, active=(), params=()):
+    # The same cursor handling as query_articles_async, against the SQL it would send
+    rows, cursor = [], None
+    sort_col, null_key, _ = api.SORT_KEYS[sort_option]
+    while True:
+        shape = frozenset(active) | ({"cursor"} if cursor else set())
+        page = conn.execute(api.build_articles_sql(shape, sort_option), [*params, *(api.cursor_params(*cursor) if cursor else ()), limit]).fetchall()
+        rows.extend(page)
+        if len(page) < limit: return rows
+        key = page[-1][api.LIST_COLUMNS.split(", ").index(sort_col)]
+        cursor = api.decode_cursor(api.encode_cursor(null_key if key is None else key, page[-1][0]))
+
+
+@pytest.mark.parametrize("sort_option", list(api.SORT_KEYS))
+def test_keyset_pages_reach_rows_with_null_sort_keys(articles_db, sort_option):
+    rows = fetch_all_pages(articles_db, sort_option)
+    assert sorted(row[0] for row in rows) == list(range(1, 38))
+
+
+def test_keyset_pages_with_filters(articles_db):
+    start, end = api.month_bounds("2024-08")
+    rows = fetch_all_pages(articles_db, "Oldest First", limit=3, active=("category", "month"), params=("Politics", start, end))
+    expected = articles_db.execute("SELECT rowid FROM articles WHERE article_category = 'Politics' AND published_at_epoch >= ? AND published_at_epoch < ?",
+                                   (start, end)).fetchall()
+    assert sorted(row[0] for row in rows) == sorted(row[0] for row in expected)
+
+
+@pytest.mark.parametrize("sort_option", list(api.SORT_KEYS))
+def test_cursor_pages_seek_the_sort_index(tmp_path, sort_option):
+    conn = sqlite3.connect(tmp_path / "plan.db")
+    conn.execute("CREATE TABLE articles (original_url TEXT PRIMARY KEY, original_title TEXT, llm_generated_title TEXT, author TEXT, source TEXT, "
+                 "article_category TEXT, article_url_to_image TEXT, published_at_epoch INTEGER)")
+    conn.execute(f"CREATE INDEX idx_epoch ON articles({api.EPOCH_KEY})")
+    conn.execute(f"CREATE INDEX idx_title ON articles({api.TITLE_KEY})")
+    sql = api.build_articles_sql(frozenset({"cursor"}), sort_option)
+    plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, (*api.cursor_params(1, 1), 10)))
+    assert plan.startswith("SEARCH articles USING INDEX"), plan
+    conn.close()
@@ -0,0 +1,207 @@
+"""update_db's storage side against a temporary SQLite file: JSON columns, init_db's triggers and the timed flush."""
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+for dependency in ("openai", "pydantic", "tiktoken", "trafilatura", "lxml", "dotenv", "requests", "orjson"):
+    pytest.importorskip(dependency)
+
+# The script exits at import without API keys; nothing here calls either API
+os.environ.setdefault("NEWS_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import update_db  # the tokenizer is only built on first use, so this works offline
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_db, "DB_NAME", str(tmp_path / "news_data.db"))
+    monkeypatch.setattr(update_db, "_thread_conns", threading.local())
+    update_db.init_db()
+    conn = update_db.get_conn()
+    yield conn
+    conn.close()
+
+
+def make_row(n, category="Politics", published_at="2025-08-01T12:00:00Z", title=None):
+    return update_db.article_row({
+        "article_url": f"https://example.com/{n}",
+        "original_title": title or f"Article {n}",
+        "published_at": published_at,
+        "article_content": f"Body of article {n}",
+        "article_category": category,
+        "historical_context": [],
+        "glossary": [],
+    })
+
+
+def counts(conn, table):
+    return dict(conn.execute(f"SELECT * FROM {table} WHERE n > 0").fetchall())
+
+
+@pytest.mark.parametrize("value, expected", [
+    ([{"year": "1990", "title": "t", "summary": "s"}], '[{"year":"1990","title":"t","summary":"s"}]'),
+    ('[{"word": "tariff", "definition": "a tax"}]', '[{"word":"tariff","definition":"a tax"}]'),
+    ('[{"year": "19', "[]"),
+    ("not json", "[]"),
+    ('{"a": 1}', "[]"),
+    (None, "[]"),
+])
+def test_to_json_text(value, expected):
+    assert update_db.to_json_text(value) == expected
+
+
+def test_to_json_text_dumps_models():
+    entry = update_db.GlossaryEntry(word="tariff", definition="a tax")
+    assert update_db.to_json_text([entry]) == '[{"word":"tariff","definition":"a tax"}]'
+
+
+def test_filter_summaries_follow_inserts_updates_and_deletes(conn):
+    update_db.store_articles([make_row(1), make_row(2), make_row(3, "Business", "2025-08-02T08:00:00Z"), make_row(4, published_at=None)])
+    day = update_db.parse_published_at("2025-08-01T12:00:00Z").timestamp() // 86400
+    assert counts(conn, "article_categories") == {"Politics": 3, "Business": 1}
+    assert counts(conn, "article_days") == {day: 2, day + 1: 1}
+
+    # An upsert that moves an article to another category and day
+    update_db.store_articles([make_row(1, "Business", "2025-08-02T09:00:00Z")])
+    assert counts(conn, "article_categories") == {"Politics": 2, "Business": 2}
+    assert counts(conn, "article_days") == {day: 1, day + 1: 2}
+
+    with conn:
+        conn.execute("DELETE FROM articles WHERE original_url IN ('https://example.com/2', 'https://example.com/4')")
+    assert counts(conn, "article_categories") == {"Business": 2}
+    assert counts(conn, "article_days") == {day + 1: 2}
+
+
+def test_search_index_follows_upserts(conn):
+    update_db.store_articles([make_row(1, title="Tariff talks resume")])
+    match = f"SELECT rowid FROM {update_db.FTS_TABLE_NAME} WHERE {update_db.FTS_TABLE_NAME} MATCH ?"
+    assert len(conn.execute(match, ('"ariff"',)).fetchall()) == 1
+    update_db.store_articles([make_row(1, title="Trade talks resume")])
+    assert conn.execute(match, ('"ariff"',)).fetchall() == []
+
+
+def test_init_db_rewrites_invalid_json_columns(conn):
+    with conn:
+        conn.executemany("INSERT INTO articles (original_url, historical_context, glossary) VALUES (?, ?, ?)", [
+            ("https://example.com/1", '[{"year": "19', "[]"),
+            ("https://example.com/2", '[{"year":"1990"}]', "not json"),
+        ])
+    update_db.init_db()
+    assert conn.execute("SELECT historical_context, glossary FROM articles ORDER BY rowid").fetchall() == [
+        ("[]", "[]"), ('[{"year":"1990"}]', "[]"),
+    ]
+
+
+def test_rows_are_flushed_on_a_timer_while_llm_calls_are_running(conn, monkeypatch):
+    raw_articles = [{"url": f"https://example.com/{n}", "publishedAt": f"2025-08-0{n}T00:00:00Z"} for n in (1, 2, 3)]
+    monkeypatch.setattr(update_db, "fetch_news_articles", lambda *args, **kwargs: (raw_articles, None))
+    monkeypatch.setattr(update_db, "scrape_article", lambda article: "text")
+    monkeypatch.setattr(update_db, "optimize_indexes", lambda: None)
+    monkeypatch.setattr(update_db, "STORE_FLUSH_EVERY", 100)
+    monkeypatch.setattr(update_db, "STORE_FLUSH_SECONDS", 0.2)
+
+    def run_llm_pass(article, text):
+        if article["url"].endswith("/1"): time.sleep(1.5)  # the oldest article is submitted last and finishes last
+        return make_row(article["url"].rsplit("/", 1)[1])
+    monkeypatch.setattr(update_db, "run_llm_pass", run_llm_pass)
+
+    flushes = []
+    store_articles = update_db.store_articles
+    def record_flush(rows):
+        flushes.append(len(rows))
+        return store_articles(rows)
+    monkeypatch.setattr(update_db, "store_articles", record_flush)
+
+    update_db.process_and_store_articles(force_refresh=True)
+    assert flushes[0] == 2  # written before the slow call finished, not held back for a count-based flush
+    assert sum(flushes) == 3
+    assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 3
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code, self._payload, self.headers = status_code, payload, headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+def test_newsapi_fetch_is_conditional_unless_forced(conn, monkeypatch):
+    sent = []
+    def get(url, headers, timeout):
+        sent.append(headers)
+        return FakeResponse(200, {"status": "ok", "articles": [{"url": "https://example.com/1"}]}, {"ETag": '"v2"'})
+    monkeypatch.setattr(update_db.http_session, "get", get)
+    update_db.save_fetch_meta("newsapi:news:2025-07-20:2025-08-06", '"v1"', None)
+
+    articles, validators = update_db.fetch_news_articles("key", "2025-07-20", "2025-08-06")
+    assert sent[-1] == {"If-None-Match": '"v1"'}
+    assert validators == ("newsapi:news:2025-07-20:2025-08-06", '"v2"', None)
+    update_db.fetch_news_articles("key", "2025-07-20", "2025-08-06", conditional=False)
+    assert sent[-1] == {}
+
+
+@pytest.mark.parametrize("llm_fails, saved", [(False, True), (True, False)])
+def test_newsapi_validators_are_saved_only_when_every_article_is_stored(conn, monkeypatch, llm_fails, saved):
+    raw_articles = [{"url": f"https://example.com/{n}", "publishedAt": "2025-08-01T00:00:00Z"} for n in (1, 2)]
+    monkeypatch.setattr(update_db, "fetch_news_articles", lambda *args, **kwargs: (raw_articles, ("newsapi:test", '"v1"', None)))
+    monkeypatch.setattr(update_db, "scrape_article", lambda article: "text")
+    monkeypatch.setattr(update_db, "optimize_indexes", lambda: None)
+    monkeypatch.setattr(update_db, "run_llm_pass", lambda article, text: None if llm_fails and article["url"].endswith("/2") else make_row(article["url"][-1]))
+
+    update_db.process_and_store_articles(force_refresh=True)
+    assert (update_db.load_fetch_meta("newsapi:test") == ('"v1"', None)) is saved
+
+
+def test_articles_pending_in_a_batch_job_are_not_queued_again(conn, monkeypatch):
+    with conn:
+        conn.execute("INSERT INTO llm_batch_articles (batch_id, custom_id, article_json, article_content) VALUES (?, ?, ?, ?)",
+                     ("batch_1", "article-0", '{"url": "https://example.com/1"}', "text"))
+    raw_articles = [{"url": f"https://example.com/{n}", "publishedAt": "2025-08-01T00:00:00Z"} for n in (1, 2)]
+    monkeypatch.setattr(update_db, "fetch_news_articles", lambda *args, **kwargs: (raw_articles, None))
+    queued = []
+    monkeypatch.setattr(update_db, "submit_llm_batch", lambda articles: queued.extend(a["url"] for a in articles) or len(articles))
+
+    update_db.process_and_store_articles(force_refresh=True, use_batch=True)
+    assert queued == ["https://example.com/2"]
+
+
+def test_batch_requests_carry_the_strict_response_schema(conn, monkeypatch):
+    uploaded = {}
+    class FakeFiles:
+        def create(self, file, purpose):
+            uploaded["lines"] = file[1].decode().splitlines()
+            return types.SimpleNamespace(id="file_1")
+    class FakeBatches:
+        def create(self, **kwargs):
+            return types.SimpleNamespace(id="batch_1")
+    monkeypatch.setattr(update_db, "openai_client", types.SimpleNamespace(files=FakeFiles(), batches=FakeBatches()))
+    monkeypatch.setattr(update_db, "scrape_article", lambda article: "text")
+    monkeypatch.setattr(update_db, "truncate_for_llm", lambda text: text)  # keeps the tokenizer (and its download) out
+
+    assert update_db.submit_llm_batch([{"url": "https://example.com/1"}]) == 1
+    response_format = json.loads(uploaded["lines"][0])["body"]["response_format"]
+    assert response_format["json_schema"]["strict"] is True
+    assert response_format["json_schema"]["schema"]["additionalProperties"] is False
+
+
+def test_truncate_for_llm_cuts_at_the_token_budget(monkeypatch):
+    class ByteEncoding:  # one token per byte, standing in for the model's BPE
+        def encode(self, text, disallowed_special):
+            return list(text.encode())
+        def decode(self, tokens):
+            return bytes(tokens).decode()
+    monkeypatch.setattr(update_db, "get_llm_encoding", ByteEncoding)
+    monkeypatch.setattr(update_db, "MAX_LLM_INPUT_TOKENS", 5)
+    assert update_db.truncate_for_llm("short") == "short"
+    assert update_db.truncate_for_llm("longer text") == "longe"
@@ -3,20 +3,29 @@
 # Fetches, Scrapes, Processes News and Stores in SQLite DB
 # ==============================================================================
 print("--- Backend Script Started: Importing Libraries ---")
-import pandas as pd
 import os
+import argparse
 import time
+import re
+import threading
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
 from openai import OpenAI
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import List
-from newspaper import Article
+import trafilatura
 from dotenv import load_dotenv
 import sqlite3
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta, timezone
+import lxml.etree
+import lxml.html
+import tiktoken
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 print("Libraries imported.")
 
@@ -48,6 +57,19 @@ else:
 if not keys_valid:
     exit()
 
+# One pooled session for NewsAPI and every article page: keep-alive skips a TCP + TLS handshake per request
+# to hosts already seen. The pool is sized past SCRAPE_WORKERS so concurrent scrapes never wait on a socket.
+# Retries back off exponentially (0.3s, 0.6s) and only for transient failures: connection errors, 429 (honouring
+# Retry-After) and 5xx. Any other 4xx fails fast; raise_on_status=False hands the last response to raise_for_status.
+http_session = requests.Session()
+http_retry = Retry(
+    total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False,
+)
+http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=http_retry)
+http_session.mount("https://", http_adapter)
+http_session.mount("http://", http_adapter)
+
 # ==============================================================================
 # DEFINITIONS
 # ==============================================================================
@@ -61,6 +83,10 @@ class GlossaryEntry(BaseModel):
     word: str
     definition: str
 
+# Dump a whole entry list in one pydantic-core call instead of a Python-level model_dump() per entry
+TIMELINE_ADAPTER = TypeAdapter(List[TimelineEntry])
+GLOSSARY_ADAPTER = TypeAdapter(List[GlossaryEntry])
+
 class OutputResponseFormat(BaseModel):
     title_entry: str
     timeline_entries: List[TimelineEntry]
@@ -73,10 +99,9 @@ ALLOWED_CATEGORIES = [
     "Entertainment", "World News", "US News", "Other"
 ]
 
-meta_prompt = f"""Given a news article, perform the following tasks:
-
-Here's the news article:
-{{}}
+# Static instructions, sent as the system message ahead of the article so every call shares a byte-identical
+# prefix that OpenAI can prompt-cache; the article itself is the only per-call input
+meta_prompt = f"""Given a news article (sent as the user message), perform the following tasks:
 
 Output
 
@@ -96,13 +121,82 @@ Output
    - Final bullet starts with “Why it matters:” and states the significance.
 """
 
+LLM_MODEL = "gpt-4o"
+MAX_LLM_INPUT_TOKENS = 8000  # article tokens sent per LLM call; the stored article_content stays whole
+# New LLM calls wait for the rate-limit window to reset once OpenAI reports it this close to empty
+LLM_MIN_REMAINING_REQUESTS = 2
+LLM_MIN_REMAINING_TOKENS = 2 * MAX_LLM_INPUT_TOKENS
+
 DB_NAME = "news_data.db"
 TABLE_NAME = "articles"
+FTS_TABLE_NAME = "articles_fts"
+FETCH_META_TABLE_NAME = "fetch_meta"  # HTTP validators (ETag / Last-Modified) from the last NewsAPI fetch per query
+URL_CACHE_TABLE_NAME = "url_cache"    # extracted text of scraped article pages, with the validators they were served with
+LLM_BATCH_TABLE_NAME = "llm_batch_articles"  # scraped articles waiting on an OpenAI Batch API job (--batch / --collect)
+SEARCH_COLUMNS = ["original_title", "llm_generated_title", "article_description", "source", "article_content"]
+# Trigram tokens give indexed, case-insensitive substring matching (the old LOWER(col) LIKE '%term%' semantics)
+FTS_TOKENIZER = "trigram"
+STORE_CHUNK_SIZE = 5000  # rows per executemany call inside the write transaction
+STORE_FLUSH_EVERY = 20   # processed articles buffered before they are written
+STORE_FLUSH_SECONDS = 30 # ...or how long a finished article may sit in the buffer, whichever comes first
+# Paywalled sites: excluded from the NewsAPI query and dropped again locally (subdomains included) before scraping
+PAYWALL_HOSTS = frozenset({
+    "wsj.com", "nytimes.com", "ft.com", "bloomberg.com", "economist.com", "latimes.com",
+    "washingtonpost.com", "businessinsider.com", "theathletic.com", "newyorker.com",
+    "thetimes.co.uk", "financialpost.com", "lemonde.fr", "telegraph.co.uk", "irishtimes.com",
+    "sueddeutsche.de", "handelsblatt.com", "nzz.ch", "chron.com", "bostonglobe.com",
+})
+REFRESH_AFTER_DAYS = 7   # stored articles older than this are scraped and summarized again; newer ones are skipped
+SCRAPE_WORKERS = 16      # article pages fetched concurrently; spread over many hosts and almost all network wait
+LLM_WORKERS = 8          # LLM calls in flight at once; a single rate-limited API, so kept below the scrape pool
+# Indexes for the API's filter + sort paths (category/date filters, newest-first and title sorts).
+# They are ascending on purpose: the API orders by (key, rowid) and SQLite walks an ascending
+# index backwards for DESC, whereas a DESC index would need a temp b-tree for the rowid tiebreak.
+# The keys are the API's exact COALESCE expressions, which give NULL dates and titles a pageable key.
+ARTICLE_INDEXES = {
+    "idx_articles_epoch_key": "COALESCE(published_at_epoch, 0)",
+    "idx_articles_cat_epoch_key": "article_category, COALESCE(published_at_epoch, 0)",
+    "idx_articles_title_key": "COALESCE(original_title, '')",
+    "idx_articles_cat_title_key": "article_category, COALESCE(original_title, '')",
+}
+# Row counts per filter value, kept current by triggers so the API's filter options never scan articles.
+# table -> (key column, source column, key expression over a row alias, predicate for rows that count)
+FILTER_SUMMARIES = {
+    "article_categories": ("name TEXT", "article_category", "{r}.article_category", "{r}.article_category IS NOT NULL AND {r}.article_category != ''"),
+    "article_days": ("day INTEGER", "published_at_epoch", "{r}.published_at_epoch / 86400", "{r}.published_at_epoch IS NOT NULL"),  # UTC day number
+}
+
+# Per-connection tuning, applied once per connection. synchronous=NORMAL is durable under WAL (only the last commits can roll back on
+# power loss) and skips the fsync per commit; the rest keeps temp b-trees and hot pages in memory.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA busy_timeout=5000",
+)
+_thread_conns = threading.local()
+
+def get_conn():
+    """This thread's persistent connection to DB_NAME, opened and tuned on first use.
+
+    One per thread rather than one shared: the scrape threads write url_cache while the main thread
+    stores articles, and transactions on a shared connection would interleave.
+    """
+    conn = getattr(_thread_conns, "conn", None)
+    if conn is None:
+        conn = _thread_conns.conn = sqlite3.connect(DB_NAME)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    return conn
 
 def init_db():
     """Initialize DB & ensure summarized_content column exists."""
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_conn()
     cursor = conn.cursor()
+    # WAL is persistent in the file: writers append to the log instead of journalling pages twice,
+    # and readers of the local database are never blocked by the ingest
+    cursor.execute("PRAGMA journal_mode=WAL")
     cursor.execute(f'''
         CREATE TABLE IF NOT EXISTS {TABLE_NAME} (
             original_url TEXT PRIMARY KEY NOT NULL,
@@ -112,6 +206,7 @@ def init_db():
             source TEXT,
             published_at TEXT,
             published_at_iso TEXT,
+            published_at_epoch INTEGER,
             article_description TEXT,
             article_content TEXT,
             summarized_content TEXT,
@@ -123,149 +218,385 @@ def init_db():
             last_updated TEXT
         )
     ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {FETCH_META_TABLE_NAME} (
+            fetch_key TEXT PRIMARY KEY NOT NULL,
+            etag TEXT,
+            last_modified TEXT
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {URL_CACHE_TABLE_NAME} (
+            url TEXT PRIMARY KEY NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            text TEXT,
+            fetched_at TEXT
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {LLM_BATCH_TABLE_NAME} (
+            batch_id TEXT NOT NULL,
+            custom_id TEXT NOT NULL,
+            article_json TEXT,
+            article_content TEXT,
+            PRIMARY KEY (batch_id, custom_id)
+        )
+    ''')
     # Ensure summarized_content column exists
     cursor.execute(f"PRAGMA table_info({TABLE_NAME});")
     cols = [row[1] for row in cursor.fetchall()]
     if "summarized_content" not in cols:
         cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN summarized_content TEXT;")
         print("Added missing column: summarized_content")
+    # Epoch seconds are what the API sorts and filters on, so it never parses ISO strings at read time
+    if "published_at_epoch" not in cols:
+        cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN published_at_epoch INTEGER;")
+        print("Added missing column: published_at_epoch")
+    cursor.execute(f"""
+        UPDATE {TABLE_NAME} SET published_at_epoch = CAST(strftime('%s', published_at_iso) AS INTEGER)
+        WHERE published_at_epoch IS NULL AND published_at_iso IS NOT NULL AND published_at_iso != ''
+    """)
+    # The API embeds historical_context/glossary verbatim (orjson.Fragment); rows written before to_json_text
+    # canonicalized them may hold truncated or non-JSON text, so those are rewritten once as JSON arrays
+    stale_json = cursor.execute(f"""
+        SELECT rowid, historical_context, glossary FROM {TABLE_NAME}
+        WHERE CASE WHEN json_valid(historical_context) THEN json_type(historical_context) END IS NOT 'array'
+           OR CASE WHEN json_valid(glossary) THEN json_type(glossary) END IS NOT 'array'
+    """).fetchall()
+    if stale_json:
+        cursor.executemany(f"UPDATE {TABLE_NAME} SET historical_context = ?, glossary = ? WHERE rowid = ?",
+                           [(to_json_text(context), to_json_text(glossary), rowid) for rowid, context, glossary in stale_json])
+        print(f"Rewrote timeline/glossary JSON for {len(stale_json)} rows")
+    for old_index in ("idx_articles_pub", "idx_articles_cat_pub", "idx_articles_published", "idx_articles_cat_published",
+                      "idx_articles_epoch", "idx_articles_cat_epoch", "idx_articles_title", "idx_articles_cat_title"):
+        cursor.execute(f"DROP INDEX IF EXISTS {old_index}")
+    create_article_indexes(cursor)
+    init_search_index(cursor)
+    init_filter_summaries(cursor)
     conn.commit()
-    conn.close()
 
-def insert_or_update_article(article_data):
-    hist_context = json.dumps(article_data.get("historical_context", []))
-    gloss_context = json.dumps(article_data.get("glossary", []))
-    published_at_iso = None
-    if article_data.get("published_at"):
-        dt_obj = pd.to_datetime(article_data["published_at"], errors='coerce', utc=True)
-        if pd.notna(dt_obj):
-            published_at_iso = dt_obj.isoformat()
-
-    sql = f'''
-        INSERT INTO {TABLE_NAME} (
-            original_url, original_title, llm_generated_title, author, source,
-            published_at, published_at_iso,
-            article_description, article_content, summarized_content, article_url_to_image,
-            historical_context, glossary, article_category, llm_input_source, last_updated
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(original_url) DO UPDATE SET
-            original_title=excluded.original_title,
-            llm_generated_title=excluded.llm_generated_title,
-            author=excluded.author,
-            source=excluded.source,
-            published_at=excluded.published_at,
-            published_at_iso=excluded.published_at_iso,
-            article_description=excluded.article_description,
-            article_content=excluded.article_content,
-            summarized_content=excluded.summarized_content,
-            article_url_to_image=excluded.article_url_to_image,
-            historical_context=excluded.historical_context,
-            glossary=excluded.glossary,
-            article_category=excluded.article_category,
-            llm_input_source=excluded.llm_input_source,
-            last_updated=excluded.last_updated
-    '''
-    params = (
-        article_data.get("article_url"),
-        article_data.get("original_title"),
-        article_data.get("llm_generated_title"),
-        article_data.get("author"),
-        article_data.get("source"),
-        article_data.get("published_at"),
+def create_article_indexes(cursor):
+    for name, columns in ARTICLE_INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {TABLE_NAME}({columns})")
+
+def drop_article_indexes(cursor):
+    for name in ARTICLE_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+def init_search_index(cursor):
+    """Create the FTS5 search index over the articles table and the triggers that keep it in sync."""
+    cols = ", ".join(SEARCH_COLUMNS)
+    new_cols = ", ".join(f"new.{c}" for c in SEARCH_COLUMNS)
+    old_cols = ", ".join(f"old.{c}" for c in SEARCH_COLUMNS)
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (FTS_TABLE_NAME,))
+    row = cursor.fetchone()
+    fts_exists = row is not None
+    if fts_exists and f"tokenize='{FTS_TOKENIZER}'" not in row[0]:
+        # Built with a different tokenizer; the triggers refer to the table by name, so only the table is replaced
+        cursor.execute(f"DROP TABLE {FTS_TABLE_NAME}")
+        fts_exists = False
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE_NAME} USING fts5(
+            {cols},
+            content='{TABLE_NAME}', content_rowid='rowid',
+            tokenize='{FTS_TOKENIZER}'
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ai AFTER INSERT ON {TABLE_NAME} BEGIN
+            INSERT INTO {FTS_TABLE_NAME}(rowid, {cols}) VALUES (new.rowid, {new_cols});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_ad AFTER DELETE ON {TABLE_NAME} BEGIN
+            INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {cols}) VALUES ('delete', old.rowid, {old_cols});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_au AFTER UPDATE ON {TABLE_NAME} BEGIN
+            INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}, rowid, {cols}) VALUES ('delete', old.rowid, {old_cols});
+            INSERT INTO {FTS_TABLE_NAME}(rowid, {cols}) VALUES (new.rowid, {new_cols});
+        END
+    ''')
+    if not fts_exists:
+        # Index whatever rows were written before the search table existed
+        cursor.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES('rebuild')")
+        print(f"Built search index: {FTS_TABLE_NAME}")
+
+def init_filter_summaries(cursor):
+    """Create the per-category / per-day count tables behind the API's filter options, plus their triggers."""
+    for table, (key_def, source_col, key_expr, counts) in FILTER_SUMMARIES.items():
+        key = key_def.split()[0]
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+        exists = cursor.fetchone() is not None
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({key_def} PRIMARY KEY, n INTEGER NOT NULL DEFAULT 0)")
+        add = f"""INSERT INTO {table}({key}, n) SELECT {key_expr.format(r='new')}, 1 WHERE {counts.format(r='new')}
+                ON CONFLICT({key}) DO UPDATE SET n = n + 1;"""
+        remove = f"UPDATE {table} SET n = n - 1 WHERE {counts.format(r='old')} AND {key} = {key_expr.format(r='old')};"
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {TABLE_NAME} BEGIN {add} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {TABLE_NAME} BEGIN {remove} END")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {source_col} ON {TABLE_NAME}
+            WHEN old.{source_col} IS NOT new.{source_col} BEGIN {remove} {add} END
+        """)
+        if not exists:
+            cursor.execute(f"""
+                INSERT INTO {table}({key}, n) SELECT {key_expr.format(r=TABLE_NAME)}, COUNT(*) FROM {TABLE_NAME}
+                WHERE {counts.format(r=TABLE_NAME)} GROUP BY 1
+            """)
+            print(f"Built filter summary: {table}")
+
+def optimize_indexes():
+    """Merge the FTS5 index segments and refresh planner statistics after an ingest run.
+
+    ANALYZE writes sqlite_stat1, which ships with the database file, so the
+    API's queries pick the category/date and category/title composite indexes.
+    The FTS index is keyed on the implicit rowid, which VACUUM may renumber; run
+    INSERT INTO articles_fts(articles_fts) VALUES('rebuild') after a VACUUM.
+    """
+    conn = get_conn()
+    conn.execute(f"INSERT INTO {FTS_TABLE_NAME}({FTS_TABLE_NAME}) VALUES('optimize')")
+    conn.execute(f"ANALYZE {TABLE_NAME}")
+    conn.commit()
+
+def to_json_text(value):
+    """Canonical compact JSON for a stored list column; the API embeds this text in responses verbatim.
+
+    Pydantic entries are serialized by orjson directly, without an intermediate model_dump() list.
+    """
+    if isinstance(value, str):
+        try:
+            value = orjson.loads(value)
+        except orjson.JSONDecodeError:
+            value = []
+    return orjson.dumps(value if isinstance(value, list) else [], default=lambda o: o.model_dump()).decode()
+
+def parse_published_at(value):
+    """NewsAPI's ISO-8601 publishedAt as an aware UTC datetime (naive values are taken as UTC), or None."""
+    try:
+        dt_obj = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    return dt_obj.replace(tzinfo=timezone.utc) if dt_obj.tzinfo is None else dt_obj.astimezone(timezone.utc)
+
+def article_row(article_data):
+    """Build the upsert parameter tuple for one article."""
+    get = article_data.get  # bound once; every column below is a lookup on the same dict
+    published_at_iso, published_at_epoch = None, None
+    dt_obj = parse_published_at(get("published_at"))
+    if dt_obj:
+        published_at_iso = dt_obj.isoformat()
+        published_at_epoch = int(dt_obj.timestamp())
+
+    return (
+        get("article_url"),
+        get("original_title"),
+        get("llm_generated_title"),
+        get("author"),
+        get("source"),
+        get("published_at"),
         published_at_iso,
-        article_data.get("article_description"),
-        article_data.get("article_content"),
-        article_data.get("summarized_content"),
-        article_data.get("article_url_to_image"),
-        hist_context,
-        gloss_context,
-        article_data.get("article_category"),
-        article_data.get("llm_input_source"),
+        published_at_epoch,
+        get("article_description"),
+        get("article_content"),
+        get("summarized_content"),
+        get("article_url_to_image"),
+        to_json_text(get("historical_context", [])),
+        to_json_text(get("glossary", [])),
+        get("article_category"),
+        get("llm_input_source"),
         datetime.now().isoformat()
     )
 
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute(sql, params)
-    conn.commit()
-    conn.close()
+# Built once from TABLE_NAME; the identical text keeps hitting sqlite3's per-connection statement cache
+_UPSERT_SQL = f'''
+    INSERT INTO {TABLE_NAME} (
+        original_url, original_title, llm_generated_title, author, source,
+        published_at, published_at_iso, published_at_epoch,
+        article_description, article_content, summarized_content, article_url_to_image,
+        historical_context, glossary, article_category, llm_input_source, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(original_url) DO UPDATE SET
+        original_title=excluded.original_title,
+        llm_generated_title=excluded.llm_generated_title,
+        author=excluded.author,
+        source=excluded.source,
+        published_at=excluded.published_at,
+        published_at_iso=excluded.published_at_iso,
+        published_at_epoch=excluded.published_at_epoch,
+        article_description=excluded.article_description,
+        article_content=excluded.article_content,
+        summarized_content=excluded.summarized_content,
+        article_url_to_image=excluded.article_url_to_image,
+        historical_context=excluded.historical_context,
+        glossary=excluded.glossary,
+        article_category=excluded.article_category,
+        llm_input_source=excluded.llm_input_source,
+        last_updated=excluded.last_updated
+'''
+
+def store_articles(rows):
+    """Upsert article rows with executemany in one transaction (chunked), instead of one connection and commit per row."""
+    if not rows:
+        return 0
+    conn = get_conn()
+    with conn:
+        for i in range(0, len(rows), STORE_CHUNK_SIZE):
+            conn.executemany(_UPSERT_SQL, rows[i:i + STORE_CHUNK_SIZE])
+    return len(rows)
+
+def insert_or_update_article(article_data):
+    store_articles([article_row(article_data)])
     return True
 
-def summarize_article_content(article_text: str):
-    """Generate ≤5 bullet summary; fallback to full article_content."""
-    summary_prompt = f"""
-Summarize the article below into ≤5 bullets a reader can scan in under a minute.
+def load_fetch_meta(fetch_key):
+    conn = get_conn()
+    row = conn.execute(f"SELECT etag, last_modified FROM {FETCH_META_TABLE_NAME} WHERE fetch_key = ?", (fetch_key,)).fetchone()
+    return row or (None, None)
 
-Rules:
-- 1 sentence per bullet; ≤18 words each.
-- Final bullet starts with 'Why it matters:' and states significance.
+def save_fetch_meta(fetch_key, etag, last_modified):
+    conn = get_conn()
+    with conn:
+        conn.execute(f"INSERT OR REPLACE INTO {FETCH_META_TABLE_NAME} (fetch_key, etag, last_modified) VALUES (?, ?, ?)", (fetch_key, etag, last_modified))
 
-Article:
-{article_text}
-"""
-    try:
-        resp = openai_client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": summary_prompt}],
-            temperature=0.3
-        )
-        return resp.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"Summary generation failed: {e}")
-        return article_text  # fallback
-
-def fetch_news_articles(api_key, from_date, to_date, search_query="news"):
-    excluded = (
-        "wsj.com,nytimes.com,ft.com,bloomberg.com,economist.com,latimes.com,"
-        "washingtonpost.com,businessinsider.com,theathletic.com,newyorker.com,"
-        "thetimes.co.uk,financialpost.com,lemonde.fr,telegraph.co.uk,irishtimes.com,"
-        "sueddeutsche.de,handelsblatt.com,nzz.ch,chron.com,bostonglobe.com"
-    )
+def fetch_news_articles(api_key, from_date, to_date, search_query="news", conditional=True):
+    """Fetch one NewsAPI page; returns (articles, validators).
+
+    With conditional, the previous response's ETag / Last-Modified are replayed, so an unchanged result set
+    comes back as a bodiless 304 and yields no articles. validators is (fetch_key, etag, last_modified) from
+    a fresh 200, or None; the caller saves it with save_fetch_meta only once every article is stored.
+    """
+    excluded = ",".join(sorted(PAYWALL_HOSTS))
     api_url = (
         f"https://newsapi.org/v2/everything?"
         f"q={search_query}&language=en&from={from_date}&to={to_date}&"
         f"sortBy=popularity&excludeDomains={excluded}&pageSize=100&apiKey={api_key}"
     )
+    fetch_key = f"newsapi:{search_query}:{from_date}:{to_date}"
+    etag, last_modified = load_fetch_meta(fetch_key) if conditional else (None, None)
+    headers = {}
+    if etag: headers["If-None-Match"] = etag
+    if last_modified: headers["If-Modified-Since"] = last_modified
     try:
-        response = requests.get(api_url, timeout=15)
+        response = http_session.get(api_url, headers=headers, timeout=15)
+        if response.status_code == 304:
+            print("NewsAPI results unchanged since the last run.")
+            return [], None
         response.raise_for_status()
         data = response.json()
         if data.get("status") == "ok":
-            return data.get("articles", [])
-        return []
+            validators = (fetch_key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return data.get("articles", []), validators if validators[1] or validators[2] else None
+        return [], None
     except Exception as e:
         print(f"NewsAPI request error: {e}")
-        return []
+        return [], None
+
+def load_url_cache(url):
+    conn = get_conn()
+    row = conn.execute(f"SELECT etag, last_modified, text FROM {URL_CACHE_TABLE_NAME} WHERE url = ?", (url,)).fetchone()
+    return row
+
+def save_url_cache(url, etag, last_modified, text):
+    conn = get_conn()
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {URL_CACHE_TABLE_NAME} (url, etag, last_modified, text, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (url, etag, last_modified, text, datetime.now().isoformat())
+        )
+
+# Page chrome whose <p> text is not article body; removed in one tree walk before the paragraph fallback reads it
+_STRIP_TAGS = ("script", "style", "nav", "header", "footer", "iframe")
 
-def scrape_article_text_newspaper(url):
+def extract_article_text(url, resp):
     try:
-        article = Article(url, fetch_images=False)
-        article.download()
-        article.parse()
-        if article.text and len(article.text) > 200:
-            return article.text
+        # trafilatura: a single lxml pass with boilerplate heuristics, no download or NLP machinery of its own
+        text = trafilatura.extract(resp.text, url=url, include_comments=False, include_tables=False)
+        if text and len(text) > 200:
+            return text
     except:
         pass
     try:
-        resp = requests.get(url, timeout=15)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        paragraphs = soup.find_all("p")
-        content = "\n\n".join(p.get_text().strip() for p in paragraphs)
+        # Only paragraph text is needed: read it straight off lxml's tree, no BeautifulSoup wrapper
+        tree = lxml.html.fromstring(resp.content)
+        lxml.etree.strip_elements(tree, *_STRIP_TAGS, with_tail=False)
+        texts = (p.text_content().strip() for p in tree.iter("p"))  # one text walk per paragraph
+        content = "\n\n".join(t for t in texts if t)
         if len(content) > 200:
             return content
     except:
         pass
     return None
 
+def scrape_article_text(url):
+    # Pages already scraped are revalidated with a conditional GET: a 304 reuses the stored text and skips
+    # both the body download and the extraction. The page is downloaded once and shared by both extractors.
+    cached = load_url_cache(url)
+    headers = {}
+    if cached and cached[0]: headers["If-None-Match"] = cached[0]
+    if cached and cached[1]: headers["If-Modified-Since"] = cached[1]
+    try:
+        resp = http_session.get(url, headers=headers, timeout=15)
+        if cached and resp.status_code == 304:
+            return cached[2]
+        resp.raise_for_status()
+    except:
+        return None
+    text = extract_article_text(url, resp)
+    etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+    if text and (etag or last_modified):
+        save_url_cache(url, etag, last_modified, text)
+    return text
+
+@functools.lru_cache(maxsize=None)
+def get_llm_encoding():
+    """The model's tokenizer, built once on first use: loading (and, uncached, downloading) the BPE ranks is the
+    expensive part, and importing the script does not need the network for it."""
+    return tiktoken.encoding_for_model(LLM_MODEL)
+
+def truncate_for_llm(text):
+    """Cut text to MAX_LLM_INPUT_TOKENS as the model counts them, rather than guessing from characters."""
+    encoding = get_llm_encoding()
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= MAX_LLM_INPUT_TOKENS else encoding.decode(tokens[:MAX_LLM_INPUT_TOKENS])
+
+_llm_resume_at = 0.0  # time.monotonic() before which no new LLM call starts; shared by the LLM worker threads
+_llm_resume_lock = threading.Lock()
+
+def parse_reset_seconds(value):
+    """Seconds in an x-ratelimit-reset-* header such as '20ms', '1.5s' or '6m0s'."""
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    return sum(float(n) * units[u] for n, u in re.findall(r"(\d+(?:\.\d+)?)(ms|s|m|h)", value or ""))
+
+def note_llm_rate_limits(headers):
+    """Hold back new calls until the window resets when the remaining requests or tokens run low."""
+    global _llm_resume_at
+    pause = 0.0
+    for kind, floor in (("requests", LLM_MIN_REMAINING_REQUESTS), ("tokens", LLM_MIN_REMAINING_TOKENS)):
+        remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+        if remaining is not None and remaining.isdigit() and int(remaining) < floor:
+            pause = max(pause, parse_reset_seconds(headers.get(f"x-ratelimit-reset-{kind}")))
+    if pause:
+        with _llm_resume_lock:
+            _llm_resume_at = max(_llm_resume_at, time.monotonic() + pause)
+
 def get_timeline_and_glossary(article_text: str):
-    prompt = meta_prompt.format(article_text)
+    # Calls go out back to back and only sleep when OpenAI's own headers say the window is nearly spent
+    delay = _llm_resume_at - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
     try:
-        resp = openai_client.beta.chat.completions.parse(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
+        raw = openai_client.beta.chat.completions.with_raw_response.parse(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": meta_prompt},
+                {"role": "user", "content": truncate_for_llm(article_text)},
+            ],
             response_format=OutputResponseFormat
         )
-        return resp.choices[0].message.parsed
+        note_llm_rate_limits(raw.headers)
+        return raw.parse().choices[0].message.parsed
     except Exception as e:
         print(f"LLM processing failed: {e}")
         return None
@@ -273,47 +604,231 @@ def get_timeline_and_glossary(article_text: str):
 # ==============================================================================
 # MAIN PROCESS
 # ==============================================================================
-def process_and_store_articles():
+def load_fresh_urls():
+    """URLs stored within the last REFRESH_AFTER_DAYS days; re-running the LLM on them would only rewrite the same row."""
+    cutoff = (datetime.now() - timedelta(days=REFRESH_AFTER_DAYS)).isoformat()
+    conn = get_conn()
+    urls = {row[0] for row in conn.execute(f"SELECT original_url FROM {TABLE_NAME} WHERE last_updated >= ?", (cutoff,))}
+    return urls
+
+def load_pending_batch_urls():
+    """URLs already queued in an unfinished batch job; --collect will store them, so they are not queued again."""
+    conn = get_conn()
+    return {row[0] for row in conn.execute(f"SELECT json_extract(article_json, '$.url') FROM {LLM_BATCH_TABLE_NAME}")}
+
+def is_paywalled(url):
+    host = (urlparse(url).hostname or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in PAYWALL_HOSTS)
+
+# NewsAPI cuts `content` off with a "… [+1234 chars]" marker; compiled once, it runs for every unscrapable article
+_TRUNC_RE = re.compile(r"\s*\[\+\s*\d+\s*chars?\].*$", re.IGNORECASE | re.DOTALL)
+
+def clean_article_content(content):
+    return _TRUNC_RE.sub("", content) if content else content
+
+def scrape_article(article_data):
+    """Article text to send to the LLM: the scraped page, else NewsAPI's own snippet; None to skip the article."""
+    url = article_data.get("url")
+    if not url:
+        return None
+    return scrape_article_text(url) or clean_article_content(article_data.get("content")) or article_data.get("description")
+
+def build_article_row(article_data, article_content, output):
+    # The meta prompt already asks for the scan-friendly bullets, so no second summary round trip per article
+    bullets = (b.strip().removeprefix("- ") for b in output.summarized_bullets)
+    summary = "\n".join(f"- {b}" for b in bullets if b) or article_content
+
+    get = article_data.get
+    db_data = {
+        "llm_generated_title": output.title_entry,
+        "original_title": get("title", "N/A"),
+        "author": get("author", "N/A"),
+        "source": (get("source") or {}).get("name", "N/A"),
+        "published_at": get("publishedAt", "N/A"),
+        "article_content": article_content,
+        "summarized_content": summary,
+        "article_url": get("url"),
+        "article_url_to_image": get("urlToImage"),
+        "historical_context": TIMELINE_ADAPTER.dump_python(output.timeline_entries, mode="json"),
+        "glossary": GLOSSARY_ADAPTER.dump_python(output.glossary_entries, mode="json"),
+        "article_category": getattr(output, "article_category", "Other"),
+        "llm_input_source": "scraper"
+    }
+    return article_row(db_data)
+
+def run_llm_pass(article_data, article_content):
+    """Run the LLM pass on a scraped article; returns its upsert row, or None to skip it."""
+    output = get_timeline_and_glossary(article_content)
+    if not output:
+        return None
+    return build_article_row(article_data, article_content, output)
+
+def submit_llm_batch(raw_articles):
+    """Scrape the articles now and queue their LLM pass as one OpenAI Batch API job (half the price, done within 24h).
+
+    The scraped text is kept in LLM_BATCH_TABLE_NAME until collect_llm_batches stores the results.
+    Returns how many articles were queued.
+    """
+    # Private SDK helper, imported only here so an SDK release that moves it can break --batch but not the ingest.
+    # Batch requests are plain JSON, so they carry the same strict schema that .parse() derives for the inline calls
+    from openai.lib._parsing._completions import type_to_response_format_param
+    response_format = type_to_response_format_param(OutputResponseFormat)
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as executor:
+        scraped = [(a, text) for a, text in zip(raw_articles, executor.map(scrape_article, raw_articles)) if text]
+    if not scraped:
+        print("No articles to submit.")
+        return 0
+
+    lines, pending = [], []
+    for i, (article_data, article_content) in enumerate(scraped):
+        custom_id = f"article-{i}"
+        request_body = {
+            "model": LLM_MODEL,
+            "messages": [
+                {"role": "system", "content": meta_prompt},
+                {"role": "user", "content": truncate_for_llm(article_content)},
+            ],
+            "response_format": response_format,
+        }
+        lines.append(json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": request_body}))
+        pending.append((custom_id, json.dumps(article_data), article_content))
+
+    batch_file = openai_client.files.create(file=("llm_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = openai_client.batches.create(input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+    conn = get_conn()
+    with conn:
+        conn.executemany(
+            f"INSERT INTO {LLM_BATCH_TABLE_NAME} (batch_id, custom_id, article_json, article_content) VALUES (?, ?, ?, ?)",
+            [(batch.id,) + p for p in pending]
+        )
+    print(f"Submitted LLM batch {batch.id} with {len(pending)} articles; run with --collect once it completes.")
+    return len(pending)
+
+def collect_llm_batches():
+    """Store the results of every finished batch job; jobs still running are left for the next --collect."""
     init_db()
+    conn = get_conn()
+    batch_ids = [row[0] for row in conn.execute(f"SELECT DISTINCT batch_id FROM {LLM_BATCH_TABLE_NAME}")]
     total_articles_saved = 0
-
-    raw_articles = fetch_news_articles(NEWS_API_KEY, "2025-07-20", "2025-08-06")
-    for article_data in raw_articles:
-        url = article_data.get("url")
-        if not url:
+    for batch_id in batch_ids:
+        batch = openai_client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            print(f"LLM batch {batch_id} ended as {batch.status}; dropping its articles.")
+        elif batch.status != "completed":
+            print(f"LLM batch {batch_id} is still {batch.status}.")
             continue
-        article_content = scrape_article_text_newspaper(url) or article_data.get("content") or article_data.get("description")
-        if not article_content:
-            continue
-
-        output = get_timeline_and_glossary(article_content)
-        summary = summarize_article_content(article_content) if article_content else None
-        if not summary:
-            summary = article_content
-
-        if output:
-            db_data = {
-                "llm_generated_title": output.title_entry,
-                "original_title": article_data.get("title", "N/A"),
-                "author": article_data.get("author", "N/A"),
-                "source": article_data.get("source", {}).get("name", "N/A"),
-                "published_at": article_data.get("publishedAt", "N/A"),
-                "article_content": article_content,
-                "summarized_content": summary,
-                "article_url": url,
-                "article_url_to_image": article_data.get("urlToImage"),
-                "historical_context": [e.model_dump() for e in output.timeline_entries],
-                "glossary": [e.model_dump() for e in output.glossary_entries],
-                "article_category": getattr(output, "article_category", "Other"),
-                "llm_input_source": "scraper"
+        elif batch.output_file_id:
+            pending = {
+                custom_id: (json.loads(article_json), article_content)
+                for custom_id, article_json, article_content in conn.execute(
+                    f"SELECT custom_id, article_json, article_content FROM {LLM_BATCH_TABLE_NAME} WHERE batch_id = ?", (batch_id,))
             }
-            insert_or_update_article(db_data)
-            total_articles_saved += 1
+            rows = []
+            for line in openai_client.files.content(batch.output_file_id).text.splitlines():
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if result.get("custom_id") not in pending or response.get("status_code") != 200:
+                    continue
+                try:
+                    output = OutputResponseFormat.model_validate_json(response["body"]["choices"][0]["message"]["content"])
+                except Exception as e:
+                    print(f"LLM batch result unusable for {result['custom_id']}: {e}")
+                    continue
+                article_data, article_content = pending[result["custom_id"]]
+                rows.append(build_article_row(article_data, article_content, output))
+            total_articles_saved += store_articles(rows)
+        with conn:
+            conn.execute(f"DELETE FROM {LLM_BATCH_TABLE_NAME} WHERE batch_id = ?", (batch_id,))
+    if total_articles_saved:
+        optimize_indexes()
+    print(f"Total new articles saved: {total_articles_saved}")
 
+def process_and_store_articles(force_refresh=False, use_batch=False):
+    init_db()
+    total_articles_saved = 0
+    pending_rows = []  # written in batches so a crash loses at most STORE_FLUSH_EVERY articles of LLM work
+    last_flush = time.monotonic()
+
+    # --force must get the full page back to have anything to reprocess, so it skips the conditional GET
+    raw_articles, fetch_validators = fetch_news_articles(NEWS_API_KEY, "2025-07-20", "2025-08-06", conditional=not force_refresh)
+    # Skip articles already processed recently before paying for their scrape and LLM calls
+    if not force_refresh:
+        fresh_urls = load_fresh_urls()
+        new_articles = [a for a in raw_articles if a.get("url") not in fresh_urls]
+        if len(new_articles) < len(raw_articles):
+            print(f"Skipping {len(raw_articles) - len(new_articles)} articles stored in the last {REFRESH_AFTER_DAYS} days.")
+        raw_articles = new_articles
+    # Articles queued in an unfinished batch job are stored by --collect, even under --force
+    pending_urls = load_pending_batch_urls()
+    new_articles = [a for a in raw_articles if a.get("url") not in pending_urls]
+    if len(new_articles) < len(raw_articles):
+        print(f"Skipping {len(raw_articles) - len(new_articles)} articles waiting on an LLM batch job.")
+    raw_articles = new_articles
+    # Paywalled pages only yield a teaser, and the freshest articles go first so they are stored first
+    raw_articles = [a for a in raw_articles if a.get("url") and not is_paywalled(a["url"])]
+    raw_articles.sort(key=lambda a: a.get("publishedAt") or "", reverse=True)
+    if use_batch:
+        queued = submit_llm_batch(raw_articles)
+        if fetch_validators and queued == len(raw_articles):
+            save_fetch_meta(*fetch_validators)
+        return
+    # Into an empty table (the initial backfill) rows go in without index upkeep; the indexes are built
+    # afterwards in one sorted pass. Incremental runs keep them live, and
+    # init_db recreates them if a bulk run dies before the end.
+    conn = get_conn()
+    bulk_load = conn.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {TABLE_NAME})").fetchone()[0]
+    if bulk_load:
+        with conn:
+            drop_article_indexes(conn)
+    # Two pipelined stages, each on its own pool: every scraped page goes to the LLM pool the moment it arrives,
+    # so later scrapes overlap earlier LLM calls. Rows come back here so SQLite is only written from this thread.
+    with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as scrape_pool, ThreadPoolExecutor(max_workers=LLM_WORKERS) as llm_pool:
+        scrapes = {scrape_pool.submit(scrape_article, article_data): article_data for article_data in raw_articles}
+        llm_calls = set()
+        while scrapes or llm_calls:
+            # The timeout wakes this loop for the time-based flush even while every LLM call is still running
+            done, _ = wait(scrapes.keys() | llm_calls, timeout=STORE_FLUSH_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                article_data = scrapes.pop(future, None)
+                llm_calls.discard(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Article processing failed: {e}")
+                    continue
+                if result is None:
+                    continue
+                if article_data is not None:  # a finished scrape: result is the article text
+                    llm_calls.add(llm_pool.submit(run_llm_pass, article_data, result))
+                    continue
+                pending_rows.append(result)
+            if len(pending_rows) >= STORE_FLUSH_EVERY or (pending_rows and time.monotonic() - last_flush >= STORE_FLUSH_SECONDS):
+                total_articles_saved += store_articles(pending_rows)
+                pending_rows = []
+                last_flush = time.monotonic()
+
+    total_articles_saved += store_articles(pending_rows)
+    if bulk_load:
+        with conn:
+            create_article_indexes(conn)
+    # Recorded only now and only if nothing failed: with a fixed from/to window, a 304 next time would
+    # otherwise hide the articles whose scrape or LLM call failed for good
+    if fetch_validators and total_articles_saved == len(raw_articles):
+        save_fetch_meta(*fetch_validators)
+    optimize_indexes()
     print(f"Total new articles saved: {total_articles_saved}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch, scrape, summarize and store news articles.")
+    parser.add_argument("--force", action="store_true", help="reprocess articles even if they were stored recently")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--batch", action="store_true", help="queue the LLM pass as an OpenAI batch job instead of calling it inline")
+    mode.add_argument("--collect", action="store_true", help="store the results of finished batch jobs")
+    args = parser.parse_args()
     if keys_valid:
-        process_and_store_articles()
+        if args.collect:
+            collect_llm_batches()
+        else:
+            process_and_store_articles(force_refresh=args.force, use_batch=args.batch)
 
 print("--- Backend Script Execution Finished ---")